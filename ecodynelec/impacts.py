@@ -5,6 +5,7 @@ Module handling the computation of impacts from an electricity mix.
 import numpy as np
 import pandas as pd
 import os
+from functools import lru_cache
 from time import time
 
 
@@ -39,15 +40,21 @@ def compute_impacts(mix_data, impact_data, strategy='error', is_verbose=False):
     
     impacts_matrix = adapt_impacts(impact_data, mix=mix_data, strategy=strategy)
     
+    # Select the columns and extract the arrays once for all indicators
+    mix = drop_mix_columns(mix_data)
+    mix_values = _float_values(mix) # float32 from the tracking
+    impact_values = _float_values(impacts_matrix.loc[mix.columns]) # float32 from adapt_impacts
+    
     if is_verbose: print("Compute the electricity impacts...\n\tGlobal...")
     collect_impacts = {}
-    collect_impacts['Global'] = compute_global_impacts(mix_data=mix_data, impact_data=impacts_matrix,)
+    collect_impacts['Global'] = pd.DataFrame(mix_values @ impact_values,
+                                             index=mix.index, columns=impacts_matrix.columns)
     
     
-    for i in impacts_matrix.columns:
+    for j, i in enumerate(impacts_matrix.columns):
         if is_verbose: print("\t{}...".format(i))
-        collect_impacts[i] = compute_detailed_impacts(mix_data=mix_data, impact_data=impacts_matrix.loc[:,i],
-                                                      indicator=i)
+        collect_impacts[i] = _scale_mix(mix_values, impact_values[:,j], index=mix.index,
+                                        columns=mix.columns, indicator=i)
     
     if is_verbose: print("Impact computation: {} sec.".format(round(time()-t3,1))) # time report
 
@@ -104,25 +111,26 @@ def equalize_impact_vector(impact_data, mix, strategy='error'):
         a new imact matrix with no missing value.
     """
     ### Identify missing
-    units_from_mix = [((not u.startswith('Mix_'))|(u.endswith('_Other')))
-                      for u in mix.columns]
+    units_from_mix = np.array([((not u.startswith('Mix_'))|(u.endswith('_Other')))
+                               for u in mix.columns], dtype=bool)
     
-    ### Create new indexes
-    new_impacts = pd.DataFrame( None, index=mix.columns[units_from_mix], columns=impact_data.columns, dtype='float32' )
+    ### Create new indexes, filled with the already known impacts
     # mix may not contain all electricity sources present in impact_data
-    to_fill = impact_data.index.intersection(new_impacts.index)
-    new_impacts.loc[to_fill, :] = impact_data.loc[to_fill, :] # Fill already known
+    new_impacts = impact_data.reindex(index=mix.columns[units_from_mix]).astype('float32')
+    values = new_impacts.to_numpy() # single NaN scan, reused below
+    nan_mask = np.isnan(values)
     
     ### Fill the missing values
-    if new_impacts.isna().to_numpy().sum()>0: # If some data still missing
+    row_has_nan = nan_mask.any(axis=1)
+    if row_has_nan.any(): # If some data still missing
         ### Identify all units with no mapping
-        missing_mapping = new_impacts.index[new_impacts.isna().sum(axis=1)>0]
+        missing_mapping = new_impacts.index[row_has_nan]
         ### Identify all units with no production
-        locate = np.logical_and( units_from_mix, mix.sum()==0 )
+        locate = np.logical_and( units_from_mix, mix.sum().to_numpy()==0 )
         missing_prod = mix.columns[locate]
         ### Cross the information: problematic units
         # problem_units = missing_mapping[~missing_mapping.str.contains("|".join(missing_prod))] # bug when all units produce
-        problem_units = missing_mapping[~np.array([m in missing_prod for m in missing_mapping])]
+        problem_units = missing_mapping[~missing_mapping.isin(missing_prod)]
         
         ### TARGET THE PROBLEMATIC UNITS FIRST (not completing the zeros before)
         if len(problem_units)>0:
@@ -134,8 +142,15 @@ def equalize_impact_vector(impact_data, mix, strategy='error'):
                 new_impacts.loc[problem_units,:] = strategy_unit(problem_units, new_impacts)
             else:
                 raise ValueError(f"Strategy `{strategy}` to infer missing impacts is unknown. Use 'error','worst' or 'unit'.")
+            values = new_impacts.to_numpy()
+            nan_mask = np.isnan(values)
+        
+        ### Complete the missing non-producing units with zeros
+        values = values.copy()
+        values[nan_mask] = 0.
+        new_impacts = pd.DataFrame(values, index=new_impacts.index, columns=new_impacts.columns)
 
-    return new_impacts.fillna(0.).astype('float32') # Complete the missing non-producing units with zeros
+    return new_impacts
 
 
 #
@@ -153,19 +168,54 @@ def strategy_worst(units, mapping):
 
 def strategy_unit(units, mapping):
     """Apply the strategy `unit` to complete missing impact values"""
-    ### WORST CASE PER UNIT TYPE, then worst case if no similar units in mapping
-    worst_units = pd.DataFrame({unit: mapping.loc[ (mapping.index.str
-                                                    .startswith(unit)) ].max()
+    ### WORST CASE PER UNIT TYPE (single groupby over the matrix)
+    worst_by_type = mapping.groupby(mapping.index.str[:-3].to_numpy()).max()
+    types = worst_by_type.index
+    # Types sharing the prefix are included (e.g. Fossil_Oil and Fossil_Oil_shale)
+    worst_units = pd.DataFrame({unit: worst_by_type.loc[types.str.startswith(unit)].max()
                                 for unit in np.unique(units.str[:-3])}).T
+    # Worst case if no similar units in mapping
     worst_units.loc[worst_units.isna().sum(axis=1)!=0] = mapping.max().values
     
     ### CREATE A TABLE WITH INFERED IMPACTS
     section = mapping.loc[units,:].copy() # Copy the whole empty part
-    for unit in units:
-        section.loc[unit,:] = worst_units.loc[unit[:-3],:].to_numpy()
+    section.loc[units,:] = worst_units.loc[units.str[:-3],:].to_numpy()
     return section
 
 
+#
+###############################################################################
+# #############################
+# # Drop Mix columns
+# #############################
+# #############################
+
+@lru_cache(maxsize=16)
+def _kept_columns(columns):
+    """Columns to keep from a tuple of mix columns: all but the "Mix_*" ones (except "Mix_*Other*")."""
+    return tuple(k for k in columns if not ((k.split("_")[0]=="Mix")&(k.find("Other")==-1)))
+
+
+def drop_mix_columns(mix_data):
+    """Removes the "Mix" columns of the electric mix data, keeping all production units
+    and the "other countries". The column selection is cached for a given set of columns.
+
+    Parameters
+    ----------
+        mix_data: pandas.DataFrame
+            the electric mix data
+
+    Returns
+    -------
+    pandas.DataFrame
+        the electric mix data without the "Mix" columns.
+    """
+    keep = _kept_columns(tuple(mix_data.columns))
+    if len(keep)==mix_data.shape[1]:
+        return mix_data # Nothing to remove
+    return mix_data.loc[:, list(keep)]
+
+
 #
 ###############################################################################
 # #############################
@@ -193,11 +243,12 @@ def compute_global_impacts(mix_data, impact_data):
     ###############################################
 
     # All production units and the "other countries" are considered
-    mix = mix_data.drop(columns=[k for k in mix_data.columns
-                                 if ((k.split("_")[0]=="Mix")&(k.find("Other")==-1))]) # delete "Mix"
+    mix = drop_mix_columns(mix_data) # delete "Mix"
 
-    # Compute the impacts
-    pollution = pd.DataFrame(np.dot(mix.values,impact_data.loc[mix.columns].values),
+    # Compute the impacts (single matrix product on contiguous arrays)
+    mix_values = _float_values(mix)
+    impact_values = _float_values(impact_data.loc[mix.columns])
+    pollution = pd.DataFrame(mix_values @ impact_values,
                              index=mix.index,columns=impact_data.columns)
 
     return pollution
@@ -233,12 +284,23 @@ def compute_detailed_impacts(mix_data, impact_data, indicator):
     #####################################################
 
     # All production units and the "other countries" are considered
-    mix = mix_data.drop(columns=[k for k in mix_data.columns
-                                 if ((k.split("_")[0]=="Mix")&(k.find("Other")==-1))]) # delete "Mix"
+    mix = drop_mix_columns(mix_data) # delete "Mix"
     
     # Impact data already charged & grid data already without useless "Mix" columns
-    pollution = pd.DataFrame(np.dot(mix,np.diag(impact_data.loc[mix.columns])),
-                             columns=mix.columns, index=mix.index) # Calculation & storage
+    mix_values = _float_values(mix)
+    return _scale_mix(mix_values, impact_data.loc[mix.columns].to_numpy(), index=mix.index,
+                      columns=mix.columns, indicator=indicator)
+
+
+def _float_values(data):
+    """Contiguous float array of a table, kept in float32 unless the table holds wider types"""
+    return np.ascontiguousarray(data.to_numpy(dtype=np.result_type(*data.dtypes, np.float32)))
+
+
+def _scale_mix(mix_values, impact_vector, index, columns, indicator):
+    """Scales each column of the mix array by its impact (broadcast, no diagonal matrix)"""
+    pollution = pd.DataFrame(mix_values * impact_vector[np.newaxis, :],
+                             columns=columns, index=index) # Calculation & storage
     pollution.rename_axis("{}_source".format(indicator),
                           axis="columns",inplace=True) # Rename the main axis of the table
     
@@ -11,11 +11,58 @@ The module contains the following classes:
 import numpy as np
 import pandas as pd
 import os
+import stat
 import warnings
+from functools import lru_cache
+from importlib.util import find_spec
 
 from ecodynelec.checking import check_frequency
 
-
+# Rows of the "Parameter" sheet holding booleans, with their attribute name.
+# Order matters: `residual local` may set `residual_global`, which is then overwritten.
+_EXCEL_BOOLEANS = {'constant exchanges': 'cst_imports',
+                   'exchanges from swissGrid': 'sg_imports',
+                   'net exchanges': 'net_exchanges',
+                   'network losses': 'network_losses',
+                   'residual local': 'residual_local',
+                   'residual global': 'residual_global',
+                   'data cleaning': 'data_cleaning'}
+
+# Rows of the "Filepath" sheet, with their attribute name
+_EXCEL_FILEPATHS = {'generation directory': 'generation',
+                    'exchange directory': 'exchanges',
+                    'saving directory': 'savedir',
+                    'UI vector': 'ui_vector',
+                    'mapping file': 'mapping',
+                    'neighboring file': 'neighbours',
+                    'gap file': 'gap',
+                    'file swissGrid': 'swissGrid',
+                    'file grid losses': 'networkLosses'}
+
+# Rows of the "Server" sheet, with their attribute name
+_EXCEL_SERVER = {'host': 'host',
+                 'port': 'port',
+                 'username': 'username',
+                 'password': 'password',
+                 'use server': 'useServer',
+                 'remove unused': 'removeUnused'}
+
+# Attributes of Parameter cast on assignment
+_BOOLEAN_ATTRS = frozenset({"cst_imports", "sg_imports", "net_exchanges", "network_losses",
+                            "residual_global", "data_cleaning"})
+_DATE_ATTRS = frozenset({"start", "end"})
+_DATE_FORMAT = "%Y-%m-%d %H:%M" # layout of the dates read from the spreadsheet
+
+
+def _is_missing(value):
+    """Same as `pd.isna` for a scalar, with no pandas call for the common str, bool, int and float values."""
+    if value is None:
+        return True
+    elif isinstance(value, (str, int)): # also bool
+        return False
+    elif isinstance(value, float): # also numpy.float64
+        return value != value
+    return pd.isna(value)
 
 
 # +
@@ -68,7 +115,9 @@ class Parameter():
         __repr__:
             allows visualization via `print()`
     """
-    _is_frozen = False # Class attribute to prevent new attributes
+    __slots__ = ("path", "server", "ctry", "target", "start", "end", "freq", "timezone",
+                 "cst_imports", "sg_imports", "net_exchanges", "network_losses", "residual_local",
+                 "residual_global", "data_cleaning", "ch_enr_model_path") # No other attribute allowed
 
     def __init__(self, excel=None):
         """Gather all necessary information to parametrize the execution of diverse
@@ -103,26 +152,15 @@ class Parameter():
         if excel is not None: # Initialize with an excel file
             self.from_excel(excel)
 
-        self._is_frozen = True # Freeze the list of attributes
-
     def __repr__(self):
-        text = {}
         attributes = ["ctry","target","start","end","freq","timezone","cst_imports","net_exchanges",
                       "network_losses","sg_imports", "residual_local", "residual_global", 'data_cleaning']
-        for a in attributes:
-            text[a] = getattr(self, a)
-
-        return ( "\n".join( [f"{a} --> {text[a]}" for a in text] )
+        return ( "\n".join( f"{a} --> {getattr(self, a)}" for a in attributes )
                 + f"\n\n{self.path} \n{self.server}" )
 
     def __setattr__(self, name, value):
-        _booleans = ["cst_imports","sg_imports","net_exchanges","network_losses",
-                    "residual_global","data_cleaning"] # Define boolean variables
-
-        if np.logical_and(self._is_frozen, not hasattr(self, name)):
-            raise AttributeError(f"'parameter' object has no attribute '{name}'")
-        elif name in ['start','end']:
-            super().__setattr__(name, pd.to_datetime(value, yearfirst=True)) # set as time
+        if name in _DATE_ATTRS:
+            super().__setattr__(name, self._to_datetime(value)) # set as time
         elif name == 'ctry':
             super().__setattr__(name, sorted(value)) # always keep sorted
         elif name in ['freq','frequency']:
@@ -130,7 +168,7 @@ class Parameter():
             if value in ['Y','M']: # Start of Month or Year only.
                 super().__setattr__(name, value+"S")
             else: super().__setattr__(name, value)
-        elif name in _booleans:
+        elif name in _BOOLEAN_ATTRS:
             super().__setattr__(name, bool(value))
         elif name in ['path','server']:
             self._set_subclass(name, value)
@@ -146,25 +184,35 @@ class Parameter():
         else:
             super().__setattr__(name, value) # otherwise just set value
 
+    @staticmethod
+    def _to_datetime(value):
+        """Parses a date, directly with the layout written by `_dates_from_excel` if possible"""
+        if isinstance(value, str):
+            try:
+                return pd.to_datetime(value, format=_DATE_FORMAT)
+            except ValueError:
+                pass # Other layouts are inferred below
+        return pd.to_datetime(value, yearfirst=True)
+
     def _set_subclass(self, name, value):
-        match = [("path",Filepath),('server',Server)]
-        if any([ ((name==n)&(isinstance(value, v))) for n,v in match]):
+        expected = _SUBCLASS_TYPES.get(name)
+        if (expected is not None) and isinstance(value, expected):
             super().__setattr__(name, value)
         else:
             raise TypeError(f"{name} attribute can not be of instance {type(value)}")
 
     def _dates_from_excel(self, array):
-        adapt = lambda x: ("0" if x<10 else "") + str(x)
-        date = array.fillna(0)
-        if date.sum()==0: return None
-        if len(date)<5: date = pd.Series( np.concatenate([ date, [1,1,0,0][len(date)-5:] ]) )
-        return "{0}-{1}-{2} {3}:{4}".format(*date.apply(adapt).values)
+        date = [0 if pd.isna(x) else int(x) for x in array] # year, month, day, hour, minute
+        if sum(date)==0: return None
+        if len(date)<5: date = date + [1,1,0,0][len(date)-5:]
+        return "{0:02d}-{1:02d}-{2:02d} {3:02d}:{4:02d}".format(*date)
 
     def _set_to_None(self):
         "Turn NaN attributes into None (e.g. from Excel, empty cells turns into NaN)"
-        attributes = [a for a in dir(self) if ((not a.startswith("_"))&(not callable( getattr(self, a) )))]
+        attributes = sorted(self.__slots__) # instance data only, no dir() scan
         for a in attributes:
-            if np.all( pd.isna(getattr(self, a)) ): setattr( self, a, None )
+            missing = pd.isna(getattr(self, a))
+            if (missing if isinstance(missing, bool) else np.all(missing)): setattr( self, a, None ) # scalars: no numpy call
 
     def from_excel(self, excel):
         """Extract parameters information from a .xlsx spreadsheet.
@@ -172,29 +220,33 @@ class Parameter():
         Parameters
         ----------
             excel: str
-                path to a .xlsx spreadsheet
+                path to a .xlsx spreadsheet (or file-like object, or pandas.ExcelFile)
         """
-        param_excel = pd.read_excel(excel, sheet_name="Parameter", index_col=0, header=None, dtype='O')
+        if not isinstance(excel, (str, os.PathLike, pd.ExcelFile)): # File-like object
+            with pd.ExcelFile(excel, engine=_EXCEL_ENGINE) as workbook: # open it once for all sheets
+                return self.from_excel(workbook)
+
+        param_excel = _read_sheet(excel, "Parameter")
+        values = param_excel.iloc[:, 0].to_dict() # first value of each row
 
-        self.ctry = np.sort(param_excel.loc["countries"].dropna().values)
-        self.target = param_excel.loc['target'].iloc[0]
+        self.ctry = param_excel.loc["countries"].dropna().tolist() # sorted when set
+        self.target = values['target']
         if isinstance(self.target, str): self.target = [self.target]
 
         self.start = self._dates_from_excel(param_excel.loc['start'])
         self.end = self._dates_from_excel(param_excel.loc['end'])
-        self.freq = param_excel.loc['frequency'].iloc[0]
-        self.timezone = param_excel.loc['timezone'].iloc[0]
+        self.freq = values['frequency']
+        self.timezone = values['timezone']
 
-        self.cst_imports = param_excel.loc['constant exchanges'].iloc[0]
-        self.sg_imports = param_excel.loc['exchanges from swissGrid'].iloc[0]
-        self.net_exchanges = param_excel.loc['net exchanges'].iloc[0]
-        self.network_losses = param_excel.loc['network losses'].iloc[0]
-        self.residual_local = param_excel.loc['residual local'].iloc[0]
-        self.residual_global = param_excel.loc['residual global'].iloc[0]
-        self.data_cleaning = param_excel.loc['data cleaning'].iloc[0]
+        # Cast all boolean rows (as pandas would for the object column)
+        for key, attribute in _EXCEL_BOOLEANS.items():
+            if attribute in _BOOLEAN_ATTRS: # Already cast: no need for the __setattr__ dispatch
+                object.__setattr__(self, attribute, bool(values[key]))
+            else:
+                setattr(self, attribute, bool(values[key])) # residual_local may change residual_global
 
-        if 'CH energy model path' in param_excel.index:
-            self.ch_enr_model_path = param_excel.loc['CH energy model path'].iloc[0]
+        if 'CH energy model path' in values:
+            self.ch_enr_model_path = values['CH energy model path']
 
         self.path = self.path.from_excel(excel)
         self.server = self.server.from_excel(excel)
@@ -243,7 +295,8 @@ class Filepath():
         __repr__:
             allows visualization via `print()`
     """
-    _is_frozen = False # Class attribute to prevent new attributes
+    __slots__ = ("generation", "exchanges", "savedir", "ui_vector", "mapping", "neighbours",
+                 "gap", "swissGrid", "networkLosses") # No other attribute allowed
 
     def __init__(self, excel=None):
         """Gather parameters about local data files for the execution of diverse
@@ -268,36 +321,36 @@ class Filepath():
         if excel is not None: # Initialize with an excel file
             self.from_excel(excel)
 
-        self._is_frozen = True # Freeze the list of attributes
-
     def __repr__(self):
         attributes = ["generation","exchanges","savedir",
                       "ui_vector","mapping","neighbours","gap","swissGrid",
                       "networkLosses"]
-        text = ""
-        for a in attributes:
-            text += f"Filepath to {a} --> {getattr(self, a)}\n"
-        return text
+        return "".join( f"Filepath to {a} --> {getattr(self, a)}\n" for a in attributes )
 
     def __setattr__(self, name, value):
-        if np.logical_and(self._is_frozen, not hasattr(self, name)):
+        if name not in self.__slots__: # Fail before checking the file system
             raise AttributeError(f"'parameter.path' object has no attribute '{name}'")
-        elif pd.isna(value):
+        elif _is_missing(value):
             super().__setattr__(name, None) # set an empty info
-        elif os.path.isdir(r"{}".format(value)):
-            super().__setattr__(name, os.path.abspath(r"{}".format(value))+"/")
-        elif os.path.isfile(r"{}".format(value)):
-            super().__setattr__(name, os.path.abspath(r"{}".format(value)))
-        elif np.logical_and(not self._is_frozen, name=='_is_frozen'):
-            super().__setattr__(name, value)
         else:
-            if name in ('generation','exchanges','savedir'): # Create them and send a warning
-                msg = f"Unidentified {name} directory {os.path.abspath(value)}. It was created as new empty directory."
+            value = str(value) # also for path-like objects
+            abs_path = os.path.abspath(value) # normalized once for all branches
+            try: # A single stat tells both if it is a directory or a file
+                mode = os.stat(value).st_mode
+            except (OSError, ValueError):
+                mode = 0
+            if stat.S_ISDIR(mode):
+                path = abs_path+os.sep
+            elif stat.S_ISREG(mode):
+                path = abs_path
+            elif name in ('generation','exchanges','savedir'): # Create them and send a warning
+                msg = f"Unidentified {name} directory {abs_path}. It was created as new empty directory."
                 warnings.warn(msg, FileNotFoundWarning)
-                os.makedirs( os.path.abspath(value) ) # Create the folder
-                super().__setattr__(name, os.path.abspath(r"{}".format(value))+"/") # Create
+                os.makedirs( abs_path ) # Create the folder
+                path = abs_path+os.sep # Create
             else:
-                raise FileNotFoundError(f'Unidentified file or directory: {os.path.abspath(value)}')
+                raise FileNotFoundError(f'Unidentified file or directory: {abs_path}')
+            super().__setattr__(name, path)
 
     def from_excel(self, excel):
         """Extract parameters information from a .xlsx spreadsheet.
@@ -307,18 +360,10 @@ class Filepath():
             excel: str
                 path to a .xlsx spreadsheet
         """
-        param_excel = pd.read_excel(excel, sheet_name="Filepath", index_col=0, header=None)
+        values = _read_sheet(excel, "Filepath").iloc[:, 0].to_dict()
 
-        self.generation = param_excel.loc['generation directory'].iloc[0]
-        self.exchanges = param_excel.loc['exchange directory'].iloc[0]
-        self.savedir = param_excel.loc['saving directory'].iloc[0]
-
-        self.ui_vector = param_excel.loc['UI vector'].iloc[0]
-        self.mapping = param_excel.loc['mapping file'].iloc[0]
-        self.neighbours = param_excel.loc['neighboring file'].iloc[0]
-        self.gap = param_excel.loc['gap file'].iloc[0]
-        self.swissGrid = param_excel.loc['file swissGrid'].iloc[0]
-        self.networkLosses = param_excel.loc['file grid losses'].iloc[0]
+        for key, attribute in _EXCEL_FILEPATHS.items():
+            setattr(self, attribute, values[key])
 
         return self
 
@@ -368,7 +413,8 @@ class Server():
         __repr__:
             allows visualization via `print()`
     """
-    _is_frozen = False # Class attribute to prevent new attributes
+    __slots__ = ("_nameGenerationFile", "_nameExchangesFile", "_remoteGenerationDir", "_remoteExchangesDir",
+                 "useServer", "removeUnused", "host", "port", "username", "password") # No other attribute allowed
 
     def __init__(self, excel=None):
         """Gather downloading parameters to configurate the execution of diverse
@@ -400,23 +446,19 @@ class Server():
         if excel is not None: # Initialize with an excel file
             self.from_excel(excel)
 
-        self._is_frozen = True # Freeze the list of attributes
-
 
     def __repr__(self):
         attributes = ['useServer','host','port','username','password','removeUnused',
                       '_remoteGenerationDir','_remoteExchangesDir']
-        text = ""
+        parts = []
         for a in attributes:
-            if a!='password': text += f"Server for {a} --> {getattr(self, a)}\n"
-            elif isinstance( getattr(self, a), str ): text += f"Server for {a} --> {'*'*len(a)}\n"
-            else: text += f"Server for {a} --> \n"
-        return text
+            if a!='password': parts.append(f"Server for {a} --> {getattr(self, a)}\n")
+            elif isinstance( getattr(self, a), str ): parts.append(f"Server for {a} --> {'*'*len(a)}\n")
+            else: parts.append(f"Server for {a} --> \n")
+        return "".join(parts)
 
     def __setattr__(self, name, value):
-        if np.logical_and(self._is_frozen, not hasattr(self, name)):
-            raise AttributeError(f"'parameter.server' object has no attribute '{name}'")
-        elif pd.isna(value):
+        if _is_missing(value):
             if name in ['useServer','removeUnused']:
                 super().__setattr__(name, False) # set False
             else: super().__setattr__(name, None) # set an empty info
@@ -438,23 +480,53 @@ class Server():
             excel: str
                 path to a .xlsx spreadsheet
         """
-        param_excel = pd.read_excel(excel, sheet_name="Server", index_col=0, header=None)
+        values = _read_sheet(excel, "Server").iloc[:, 0].to_dict()
 
-        self.host = param_excel.loc['host'].iloc[0]
-        self.port = param_excel.loc['port'].iloc[0]
-        self.username = param_excel.loc['username'].iloc[0]
-        self.password = param_excel.loc['password'].iloc[0]
-        self.useServer = param_excel.loc['use server'].iloc[0]
-        self.removeUnused = param_excel.loc['remove unused'].iloc[0]
+        for key, attribute in _EXCEL_SERVER.items():
+            setattr(self, attribute, values[key])
 
         return self
 
 
+# Types of the sub-parameters of Parameter
+_SUBCLASS_TYPES = {"path": Filepath, "server": Server}
+
+
+# +
+## READ SPREADSHEET
+# -
+
+# Parameter sheets, with the columns to parse (key/value sheets only need the first two)
+_SHEETS = {"Parameter": None, "Filepath": [0, 1], "Server": [0, 1]}
+
+# Rust-based reader (optional package python-calamine, supported from pandas 2.2), else the pandas default
+_EXCEL_ENGINE = ("calamine" if ((find_spec("python_calamine") is not None)
+                                and (tuple(int(v) for v in pd.__version__.split(".")[:2]) >= (2, 2)))
+                 else None)
+
+@lru_cache(maxsize=8)
+def _read_sheets(excel, mtime):
+    """Reads all parameter sheets of a spreadsheet at once. The result is cached
+    on the file path and its modification time, so an unchanged file is parsed once."""
+    with pd.ExcelFile(excel, engine=_EXCEL_ENGINE) as workbook:
+        return {sheet: workbook.parse(sheet, index_col=0, header=None, dtype='O', usecols=columns)
+                for sheet, columns in _SHEETS.items()}
+
+def _read_sheet(excel, sheet):
+    """Returns one parameter sheet of a spreadsheet, indexed by its first column."""
+    if isinstance(excel, pd.ExcelFile): # Workbook already opened (also path-like, checked first)
+        return excel.parse(sheet, index_col=0, header=None, dtype='O', usecols=_SHEETS[sheet])
+    elif isinstance(excel, (str, os.PathLike)):
+        excel = os.path.abspath(excel)
+        return _read_sheets(excel, os.path.getmtime(excel))[sheet].copy() # The cached table stays untouched
+    return pd.read_excel(excel, sheet_name=sheet, index_col=0, header=None, dtype='O',
+                         usecols=_SHEETS[sheet], engine=_EXCEL_ENGINE) # File-like object
+
+
 
 # +
 ## WARNING CLASS
 # -
 
 class FileNotFoundWarning(UserWarning):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
\ No newline at end of file
+    pass
\ No newline at end of file
@@ -14,6 +14,8 @@ This module contains:
     - localize_from_utc: shifts the time-zone from results.
 """
 import os.path
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
@@ -47,7 +49,7 @@ def load_config(config) -> Parameter:
     if isinstance(config, Parameter):  # If a parameter object
         p = config
     elif isinstance(config, str):
-        if any([config.endswith(k) for k in ('.xlsx', '.xls', '.ods')]):
+        if config.endswith(('.xlsx', '.xls', '.ods')):
             p = Parameter(excel=config)
         else:
             raise NotImplementedError(f"File extension for {config} is not supported.")
@@ -99,39 +101,32 @@ def load_raw_prod_exchanges(parameters: Parameter | str, is_verbose: bool = Fals
 
     if progress_bar:
         progress_bar.set_sub_label('Load auxiliary datasets...')
-    # Load SwissGrid -> if Residual or SG exchanges
-    if np.logical_or(p.residual_global, p.sg_imports):
-        if is_verbose: print('Load SwissGrid data...')
-        # Load SwissGrid data, adjusting the date parameters for the time zone difference
-        # EcoDynElec is using UTC while SwissGrid is using Europe/Zurich (UTC+1 in winter, UTC+2 in summer)
-        # The SwissGrid data is already converted to Etc/GMT+1 in by the updating script
-        # We use the most little time step possible to avoid issues with the time zones
-        range = pd.date_range(start=p.start, end=p.end, freq="15min")
-        range = range.tz_localize('Etc/GMT+1').tz_convert('UTC').tz_localize(
-            None)  # Translate to Europe/Zurich timezone then remove tz info (for comparison with data source files)
-        sg_data = aux.load_swissGrid(path_sg=p.path.swissGrid, start=str(range[0]), end=str(range[-1]), freq='15min')
-        # Shift the SwissGrid data index back by one hour to convert from Etc/GMT+1 to UTC
-        sg_data.index = pd.date_range(start=p.start, end=p.end, freq="15min")
-        # Resample the SwissGrid data to the desired frequency, after the time zone conversion
-        sg_data = sg_data.resample(p.freq).sum()
-    else:
-        sg_data = None
-    if progress_bar:
-        progress_bar.progress()
-        progress_bar.set_sub_label('Load neighbors...')
-
-    # Load Country of interest -> Always
-    neighbours = aux.load_useful_countries(path_neighbour=p.path.neighbours, ctry=p.ctry)
-
-    # Load enr production from EcoDynElec-Enr-Model, if enabled
-    if progress_bar:
-        progress_bar.progress()
-        progress_bar.set_sub_label('Load Swiss enr production model...')
-    if p.ch_enr_model_path is not None and 'CH' in p.ctry:
-        if is_verbose: print('Loading Swiss enr production model')
-        enr_prod_ch = load_ch_enr_model(p.ch_enr_model_path, p.start, p.end, p.freq)
-    else:
-        enr_prod_ch = None
+    # The auxiliary datasets are independent files: load them concurrently in threads
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        # Load SwissGrid -> if Residual or SG exchanges
+        if p.residual_global or p.sg_imports:
+            if is_verbose: print('Load SwissGrid data...')
+            sg_future = pool.submit(_load_swissgrid, p)
+        else:
+            sg_future = None
+        # Load Country of interest -> Always
+        neighbours_future = pool.submit(aux.load_useful_countries, path_neighbour=p.path.neighbours, ctry=p.ctry)
+        # Load enr production from EcoDynElec-Enr-Model, if enabled
+        if p.ch_enr_model_path is not None and 'CH' in p.ctry:
+            if is_verbose: print('Loading Swiss enr production model')
+            enr_future = pool.submit(load_ch_enr_model, p.ch_enr_model_path, p.start, p.end, p.freq)
+        else:
+            enr_future = None
+
+        sg_data = sg_future.result() if sg_future is not None else None
+        if progress_bar:
+            progress_bar.progress()
+            progress_bar.set_sub_label('Load neighbors...')
+        neighbours = neighbours_future.result()
+        if progress_bar:
+            progress_bar.progress()
+            progress_bar.set_sub_label('Load Swiss enr production model...')
+        enr_prod_ch = enr_future.result() if enr_future is not None else None
 
     if progress_bar:
         progress_bar.progress()
@@ -147,6 +142,22 @@ def load_raw_prod_exchanges(parameters: Parameter | str, is_verbose: bool = Fals
     return raw_prod_exch
 
 
+def _load_swissgrid(p: Parameter) -> pd.DataFrame:
+    """Loads the SwissGrid data of the studied period, in UTC and at the frequency of the parameters."""
+    # Load SwissGrid data, adjusting the date parameters for the time zone difference
+    # EcoDynElec is using UTC while SwissGrid is using Europe/Zurich (UTC+1 in winter, UTC+2 in summer)
+    # The SwissGrid data is already converted to Etc/GMT+1 in by the updating script
+    # We use the most little time step possible to avoid issues with the time zones
+    rng = pd.date_range(start=p.start, end=p.end, freq="15min")
+    # Translate the bounds to Europe/Zurich timezone then remove tz info (for comparison with data source files)
+    start, end = (t.tz_localize('Etc/GMT+1').tz_convert('UTC').tz_localize(None) for t in (rng[0], rng[-1]))
+    sg_data = aux.load_swissGrid(path_sg=p.path.swissGrid, start=start, end=end, freq='15min')
+    # Shift the SwissGrid data index back by one hour to convert from Etc/GMT+1 to UTC
+    sg_data.index = rng
+    # Resample the SwissGrid data to the desired frequency, after the time zone conversion
+    return _resample_sum(sg_data, p.freq)
+
+
 def load_impact_matrix(parameters: Parameter, is_verbose: bool = False) -> pd.DataFrame:
     """Loads the impact matrix from the specified parameters.
 
@@ -164,16 +175,42 @@ def load_impact_matrix(parameters: Parameter, is_verbose: bool = False) -> pd.Da
     """
 
     # Load impact matrix (UI vector by default)
-    if parameters.path.mapping is not None:  # Priority to the mapping spreadhseet, as soon as it is specified
-        impact_matrix = extract_mapping(ctry=parameters.ctry, mapping_path=parameters.path.mapping,
-                                        cst_import=parameters.cst_imports,
-                                        residual=parameters.residual_global,
-                                        target=parameters.target, is_verbose=is_verbose)
-    else:  # If no mapping specified, go for the UI vector: it can grab the default vector automatically
-        impact_matrix = extract_UI(path_ui=parameters.path.ui_vector, ctry=parameters.ctry, target=parameters.target,
-                                   cst_imports=parameters.cst_imports,
-                                   residual=parameters.residual_global)
-    return impact_matrix
+    # Priority to the mapping spreadhseet, as soon as it is specified
+    source = parameters.path.mapping if parameters.path.mapping is not None else parameters.path.ui_vector
+    mtime = os.path.getmtime(source) if isinstance(source, (str, os.PathLike)) else None
+    ctry, target = (tuple(v) if isinstance(v, list) else v for v in (parameters.ctry, parameters.target))  # hashable
+    impact_matrix = _read_impact_matrix(parameters.path.mapping, parameters.path.ui_vector, mtime,
+                                        ctry, target, parameters.cst_imports,
+                                        parameters.residual_global, is_verbose)
+    return impact_matrix.copy()  # The cached matrix stays untouched
+
+
+@lru_cache(maxsize=8)
+def _read_impact_matrix(mapping, ui_vector, mtime, ctry, target, cst_imports, residual, is_verbose):
+    """Builds the impact matrix from the mapping spreadsheet or the UI vector. The result is cached
+    on the parameters and the modification time of the file, so an unchanged file is parsed once."""
+    ctry, target = (list(v) if isinstance(v, tuple) else v for v in (ctry, target))
+    if mapping is not None:
+        return extract_mapping(ctry=ctry, mapping_path=mapping, cst_import=cst_imports, residual=residual,
+                               target=target, is_verbose=is_verbose)
+    # If no mapping specified, go for the UI vector: it can grab the default vector automatically
+    return extract_UI(path_ui=ui_vector, ctry=ctry, target=target, cst_imports=cst_imports, residual=residual)
+
+
+def _resample_sum(data: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """Sums a regular time series per period of `freq`.
+    Fixed periods (15min, 30min, H, D) are summed on integer time buckets, others use resample."""
+    offset = pd.tseries.frequencies.to_offset(freq)
+    if not isinstance(offset, pd.tseries.offsets.Tick) or len(data) == 0:
+        return data.resample(freq).sum()  # Calendar periods (week, month, year)
+    step = offset.nanos
+    bucket = data.index.asi8 // step  # Period of each row (aligned on midnight, as resample)
+    summed = data.groupby(bucket, sort=True).sum()
+    # Rebuild the time line, including periods without data (summed to zero by resample)
+    summed = summed.reindex(np.arange(bucket[0], bucket[-1] + 1), fill_value=0)
+    summed.index = pd.date_range(start=pd.Timestamp(bucket[0] * step), periods=len(summed), freq=freq,
+                                 name=data.index.name)
+    return summed
 
 
 def get_mix(parameters: Parameter, raw_prod_exch: pd.DataFrame, return_matrix: bool = False,
@@ -238,26 +275,55 @@ def get_mix(parameters: Parameter, raw_prod_exch: pd.DataFrame, return_matrix: b
                            is_verbose=is_verbose, progress_bar=progress_bar)
     if return_matrix:
         # old behavior for 'get_inverted_matrix' pipeline
-        time_steps = []
-        for step in mix_df.index.levels[0]:
-            time_steps.append(mix_df.loc[step, :])
-        return time_steps
+        return _split_time_steps(mix_df)
     prod_mix_dict = {}
-    cons_mix_dict = {}
+    cons_mix_dict = _unstack_targets(mix_df, parameters.target)
+    if return_prod_mix:
+        # Here we only consider the local production means (not the imports)
+        is_local = ~prod_mix.columns.str.startswith("Mix_Other_")  # delete "Mix_Other_xx" (other countries)
+        place = prod_mix.columns.str.rsplit('_', n=1).str[-1].to_numpy()  # country of each column, parsed once
     for target in parameters.target:
-        cons_mix_dict[f'{target}'] = mix_df[f'Mix_{target}'].unstack()
         if return_prod_mix:
-            df = prod_mix[[cl for cl in prod_mix.columns if cl.endswith(f'_{target}')]]
-            # Here we only consider the local production means (not the imports)
-            df = df.drop(columns=[k for k in df.columns if
-                                  k.startswith("Mix_Other_")])  # delete "Mix_Other_xx" (other countries)
-            # Normalize the production mix
-            df = df / df.sum(axis=1).values.reshape(-1, 1)
-            prod_mix_dict[f'{target}'] = df
+            df = prod_mix.iloc[:, np.flatnonzero((place == target) & is_local)]
+            # Normalize the production mix, stored in float32 like the consumption mix of `track_mix`
+            total = df.sum(axis=1).to_numpy()[:, np.newaxis]
+            values = np.empty(df.shape, dtype='float32')
+            with np.errstate(divide='ignore', invalid='ignore'):  # Zero totals give NaN silently, as in pandas
+                np.divide(df.to_numpy(dtype='float64'), total, out=values, casting='same_kind')
+            prod_mix_dict[f'{target}'] = pd.DataFrame(values, index=df.index, columns=df.columns)
 
     return (prod_mix_dict, cons_mix_dict) if return_prod_mix else cons_mix_dict
 
 
+def _unstack_targets(mix_df: pd.DataFrame, targets: list) -> dict:
+    """Pivots the column `Mix_{target}` of the mix matrix (indexed by time step, then source) for each target,
+    scattering all the targets at once with the index codes instead of one `unstack` per target."""
+    index = mix_df.index.remove_unused_levels()
+    steps, sources = index.levels
+    step_codes, source_codes = index.codes
+    values = mix_df[[f'Mix_{target}' for target in targets]].to_numpy()
+    out = np.full((len(targets), len(steps), len(sources)), np.nan, dtype=np.result_type(values.dtype, np.float32))
+    out[:, step_codes, source_codes] = values.T
+    return {f'{target}': pd.DataFrame(out[k], index=steps, columns=sources) for k, target in enumerate(targets)}
+
+
+def _split_time_steps(mix_df: pd.DataFrame) -> list:
+    """Splits the mix matrix (indexed by time step, then source) into one table per time step.
+    The tables of `track_mix` are stacked in equal blocks, sliced from a single array."""
+    n_steps = len(mix_df.index.levels[0])
+    n_rows = len(mix_df) // n_steps
+    step_codes, row_codes = mix_df.index.codes
+    if ((n_rows * n_steps == len(mix_df))
+            and np.array_equal(step_codes, np.repeat(np.arange(n_steps), n_rows))
+            and np.array_equal(row_codes, np.tile(row_codes[:n_rows], n_steps))):
+        values = mix_df.to_numpy()
+        rows = mix_df.index.levels[1][row_codes[:n_rows]]
+        return [pd.DataFrame(values[i * n_rows:(i + 1) * n_rows], index=rows, columns=mix_df.columns)
+                for i in range(n_steps)]
+    # Irregular blocks: select each time step by label
+    return [mix_df.loc[step, :] for step in mix_df.index.levels[0]]
+
+
 def get_impacts(mix_dict: dict, impact_matrix: pd.DataFrame, missing_mapping: str = 'error',
                 is_verbose: bool = False) -> dict:
     """Computes the impact of the given electrical mix.
@@ -308,20 +374,37 @@ def get_flows_kwh(parameters: Parameter, raw_prod_exch: pd.DataFrame) -> dict:
     """
 
     flows_dict = {}
+    columns = raw_prod_exch.columns
+    is_mix = columns.str.startswith('Mix_')  # imports and exports columns, computed once
+    # Country codes parsed once from the column names: place of each column and origin of each exchange
+    parts = columns.str.split('_')
+    place, origin = parts.str[-1].to_numpy(), parts.str[1].to_numpy()
+    values = raw_prod_exch.fillna(0).to_numpy()  # missing values count as zero, as in DataFrame.sum
+    # Column-major layout: each selected column is contiguous, which makes the row sums much faster
+    # (pandas usually returns this layout already, then no copy is made)
+    values = np.asfortranarray(values)
     for target in parameters.target:
-        flows_dict[target] = pd.DataFrame(index=raw_prod_exch.index, columns=['production', 'imports', 'exports'])
+        ends_target = place == target
         # We compute the incoming power (production + import) at each time step
         # then we multiply it by the relative mix matrix to get the mix in kWh
-        flows_dict[target]['production'] = raw_prod_exch[
-            [col for col in raw_prod_exch.columns if not col.startswith(f'Mix_') and col.endswith(target)]].sum(
-            axis=1)
-        flows_dict[target]['imports'] = raw_prod_exch[
-            [col for col in raw_prod_exch.columns if col.startswith(f'Mix_') and col.endswith(target)]].sum(axis=1)
-        flows_dict[target]['exports'] = raw_prod_exch[
-            [col for col in raw_prod_exch if col.startswith(f'Mix_{target}')]].sum(axis=1)
+        # The three sums are written in the columns of a single column-major array, wrapped without copy
+        flows = np.empty((values.shape[0], 3), dtype=values.dtype, order='F')
+        _sum_columns(values, ~is_mix & ends_target, out=flows[:, 0])  # production
+        _sum_columns(values, is_mix & ends_target, out=flows[:, 1])  # imports
+        _sum_columns(values, is_mix & (origin == target), out=flows[:, 2])  # exports
+        flows_dict[target] = pd.DataFrame(flows, index=raw_prod_exch.index,
+                                          columns=['production', 'imports', 'exports'], copy=False)
     return flows_dict
 
 
+def _sum_columns(values: np.ndarray, mask: np.ndarray, out: np.ndarray) -> np.ndarray:
+    """Sums the selected columns of an array at each row into `out` (zeros if none is selected, as pandas)."""
+    if not mask.any():
+        out[:] = 0
+        return out
+    return values[:, mask].sum(axis=1, out=out)
+
+
 def translate_to_timezone(parameters: Parameter, flows_dict: dict = None, prod_mix_dict: dict = None,
                           mix_dict: dict = None, prod_imp_dict: dict = None, imp_dict: dict = None,
                           is_verbose: bool = False):
@@ -357,20 +440,20 @@ def translate_to_timezone(parameters: Parameter, flows_dict: dict = None, prod_m
     """
     if parameters.timezone is not None:
         if is_verbose: print(f"Adapt timezone: UTC >> {parameters.timezone}")
+        known = []  # (UTC, local) indexes already converted, shared by most tables
         for target in parameters.target:
             if flows_dict is not None:
-                flows_dict[target] = localize_from_utc(data=flows_dict[target], timezone=parameters.timezone)
+                flows_dict[target] = _localize_known(flows_dict[target], parameters.timezone, known)
             if prod_mix_dict is not None:
-                prod_mix_dict[target] = localize_from_utc(data=prod_mix_dict[target], timezone=parameters.timezone)
+                prod_mix_dict[target] = _localize_known(prod_mix_dict[target], parameters.timezone, known)
             if mix_dict is not None:
-                mix_dict[target] = localize_from_utc(data=mix_dict[target], timezone=parameters.timezone)
+                mix_dict[target] = _localize_known(mix_dict[target], parameters.timezone, known)
             if prod_imp_dict is not None:
                 for k in prod_imp_dict[target].keys():
-                    prod_imp_dict[target][k] = localize_from_utc(data=prod_imp_dict[target][k],
-                                                                 timezone=parameters.timezone)
+                    prod_imp_dict[target][k] = _localize_known(prod_imp_dict[target][k], parameters.timezone, known)
             if imp_dict is not None:
                 for k in imp_dict[target].keys():
-                    imp_dict[target][k] = localize_from_utc(data=imp_dict[target][k], timezone=parameters.timezone)
+                    imp_dict[target][k] = _localize_known(imp_dict[target][k], parameters.timezone, known)
     return flows_dict, prod_mix_dict, mix_dict, prod_imp_dict, imp_dict
 
 
@@ -404,31 +487,30 @@ def save_results(parameters: Parameter, flows_dict: dict = None, impact_matrix:
         if parameters.path.mapping is not None and impact_matrix is not None:  # Impact vector saved only if use of Mapping xlsx
             saving.save_impact_vector(impact_matrix, savedir=parameters.path.savedir, cst_import=parameters.cst_imports,
                                       residual=parameters.residual_global)
+        tasks = []  # Files to write, as keyword arguments of saving.save_dataset
         for country in parameters.target:
-            path = os.path.abspath(f'{parameters.path.savedir}{country}/')
-            if not os.path.isdir(path):
-                os.makedirs(path)
+            savedir = f'{parameters.path.savedir}{country}/'
+            os.makedirs(savedir, exist_ok=True)
             if flows_dict is not None:
-                saving.save_dataset(data=flows_dict[country], savedir=f'{parameters.path.savedir}{country}/',
-                                    name="RawFlows",
-                                    freq=parameters.freq)
+                tasks.append(dict(data=flows_dict[country], savedir=savedir, name="RawFlows"))
             if prod_mix_dict is not None:
-                saving.save_dataset(data=prod_mix_dict[country], savedir=f'{parameters.path.savedir}{country}/',
-                                    name="ProdMix",
-                                    freq=parameters.freq)
+                tasks.append(dict(data=prod_mix_dict[country], savedir=savedir, name="ProdMix"))
             if mix_dict is not None:
-                saving.save_dataset(data=mix_dict[country], savedir=f'{parameters.path.savedir}{country}/', name=f"Mix",
-                                    freq=parameters.freq)
+                tasks.append(dict(data=mix_dict[country], savedir=savedir, name="Mix"))
             if prod_imp_dict is not None:
                 imp = prod_imp_dict[country]
                 for k in imp:
-                    saving.save_dataset(data=imp[k], savedir=f'{parameters.path.savedir}{country}/',
-                                        name=f'ProdImpact_{k.replace("_", "-")}', freq=parameters.freq)
+                    tasks.append(dict(data=imp[k], savedir=savedir, name=f'ProdImpact_{k.replace("_", "-")}'))
             if imp_dict is not None:
                 imp = imp_dict[country]
                 for k in imp:
-                    saving.save_dataset(data=imp[k], savedir=f'{parameters.path.savedir}{country}/',
-                                        name=f'Impact_{k.replace("_", "-")}', freq=parameters.freq)
+                    tasks.append(dict(data=imp[k], savedir=savedir, name=f'Impact_{k.replace("_", "-")}'))
+
+        # Independent files: overlap the writes in threads
+        with ThreadPoolExecutor() as pool:
+            futures = [pool.submit(saving.save_dataset, freq=parameters.freq, **task) for task in tasks]
+            for future in futures:
+                future.result()  # raise any error from the writes
 
 
 def localize_from_utc(data: pd.DataFrame, timezone: str = 'CET') -> pd.DataFrame:
@@ -440,10 +522,37 @@ def localize_from_utc(data: pd.DataFrame, timezone: str = 'CET') -> pd.DataFrame
     :return: a table with shifted TimeIndex to the right time zone
     :rtype: `pandas.DataFrame`
     """
-    return data.tz_localize(tz='utc').tz_convert(tz=timezone).tz_localize(None)
+    return data.set_axis(_localize_index(data.index, timezone=timezone), axis=0)
+
+
+def _localize_index(index: pd.DatetimeIndex, timezone: str = 'CET') -> pd.DatetimeIndex:
+    """Shifts a UTC DatetimeIndex to another time zone (naive result)."""
+    offset = _fixed_utc_offset(timezone)
+    if offset is not None and isinstance(index, pd.DatetimeIndex) and index.tz is None:
+        return pd.DatetimeIndex(index + offset, freq=None)  # No daylight saving time: a constant shift
+    return index.tz_localize(tz='utc').tz_convert(tz=timezone).tz_localize(None)
 
 
-def get_producing_mix_kwh(flows_df: pd.DataFrame, prod_mix_df: pd.DataFrame) -> pd.DataFrame:
+def _fixed_utc_offset(timezone: str):
+    """Returns the UTC offset of a time zone without daylight saving time (e.g. 'UTC', 'Etc/GMT+1'), else None."""
+    winter, summer = pd.Timestamp('2020-01-01', tz=timezone), pd.Timestamp('2020-07-01', tz=timezone)
+    if winter.utcoffset() == summer.utcoffset():  # Same offset all year long, whatever the tzinfo class
+        return pd.Timedelta(winter.utcoffset())
+    return None
+
+
+def _localize_known(data: pd.DataFrame, timezone: str, known: list) -> pd.DataFrame:
+    """Converts the index of a dataframe from UTC, reusing an index converted before if identical.
+    `known` collects the pairs of (UTC, local) indexes and is updated in place."""
+    for utc_index, local_index in known:
+        if (data.index is utc_index) or (data.index.equals(utc_index) and data.index.name == utc_index.name):
+            return data.set_axis(local_index, axis=0, copy=False)
+    local_index = _localize_index(data.index, timezone=timezone)
+    known.append((data.index, local_index))
+    return data.set_axis(local_index, axis=0, copy=False)
+
+
+def get_producing_mix_kwh(flows_df: pd.DataFrame, prod_mix_df: pd.DataFrame, validate: bool = False) -> pd.DataFrame:
     """
     Converts a relative production mix to absolute values (in kWh) for the target country.
 
@@ -453,19 +562,21 @@ def get_producing_mix_kwh(flows_df: pd.DataFrame, prod_mix_df: pd.DataFrame) ->
         A dataframe containing the raw productions/imports/exports (in kWh) for each target.
     prod_mix_df: pd.DataFrame
         A dataframe containing the relative production mix of the target country.
+    validate: bool, default to False
+        Whether to check that the production mix sums to 1 at each time step (full pass over the table).
     Returns
     -------
         A dataframe containing the production mix in kWh for the target country.
     """
 
     total_kwh = flows_df['production']
-    power_df = prod_mix_df.copy()
-    assert np.isclose(power_df.sum(axis=1).abs().max(), 1), "Production mix sum is not equal to 1"
-    power_df = power_df.multiply(total_kwh, axis=0)
+    if validate:
+        assert np.isclose(prod_mix_df.sum(axis=1).abs().max(), 1), "Production mix sum is not equal to 1"
+    power_df = _scale_rows(prod_mix_df, total_kwh)  # new table, the relative mix is left untouched
     return power_df
 
 
-def get_consuming_mix_kwh(flows_df: pd.DataFrame, mix_df: pd.DataFrame) -> pd.DataFrame:
+def get_consuming_mix_kwh(flows_df: pd.DataFrame, mix_df: pd.DataFrame, validate: bool = False) -> pd.DataFrame:
     """
     Converts a relative consumption mix to absolute values (in kWh) for the target country.
 
@@ -475,6 +586,8 @@ def get_consuming_mix_kwh(flows_df: pd.DataFrame, mix_df: pd.DataFrame) -> pd.Da
         A dataframe containing the raw productions/imports/exports (in kWh) for each target.
     mix_df: pd.DataFrame
         A dataframe containing the relative consumption mix of the target country.
+    validate: bool, default to False
+        Whether to check that the consumption mix sums to 1 at each time step (full pass over the table).
 
     Returns
     -------
@@ -482,7 +595,16 @@ def get_consuming_mix_kwh(flows_df: pd.DataFrame, mix_df: pd.DataFrame) -> pd.Da
     """
 
     total_kwh = flows_df['production'] + flows_df['imports'] - flows_df['exports']
-    power_df = mix_df.copy()
-    assert np.isclose(power_df.sum(axis=1).abs().max(), 1), "Consumption mix sum is not equal to 1"
-    power_df = power_df.multiply(total_kwh, axis=0)
+    if validate:
+        assert np.isclose(mix_df.sum(axis=1).abs().max(), 1), "Consumption mix sum is not equal to 1"
+    power_df = _scale_rows(mix_df, total_kwh)  # new table, the relative mix is left untouched
     return power_df
+
+
+def _scale_rows(mix_df: pd.DataFrame, total: pd.Series) -> pd.DataFrame:
+    """Multiplies each row of a mix by the total of its time step. On a shared time index and
+    a single dtype, numpy broadcasting skips the index alignment of DataFrame.multiply."""
+    if not mix_df.index.equals(total.index) or mix_df.dtypes.nunique() > 1:
+        return mix_df.multiply(total, axis=0)  # Align the time steps, keep the dtype of each column
+    values = mix_df.to_numpy() * total.to_numpy()[:, np.newaxis]
+    return pd.DataFrame(values, index=mix_df.index, columns=mix_df.columns)
@@ -233,14 +233,9 @@ def get_prod_mix_impacts(config, missing_mapping='error', is_verbose=False, prog
         progress_bar.progress('Compute mix in kWh...')
     # Drop non-production lines of the mix (i.e. the first part of the mix matrix)
     for mix in mix_dict.keys():
-        prod_mix_dict[mix] = prod_mix_dict[mix].drop(
-            prod_mix_dict[mix].loc[:,
-            [k.startswith('Mix') and not k.endswith('Other') for k in prod_mix_dict[mix].columns]],
-            axis=1).astype('float32')
-        prod_mix_dict[mix] = prod_mix_dict[mix] / prod_mix_dict[mix].sum(axis=1).values.reshape(-1, 1)
-        mix_dict[mix] = mix_dict[mix].drop(
-            mix_dict[mix].loc[:, [k.startswith('Mix') and not k.endswith('Other') for k in mix_dict[mix].columns]],
-            axis=1).astype('float32')
+        prod_mix = _production_columns(prod_mix_dict[mix])
+        prod_mix_dict[mix] = prod_mix / prod_mix.sum(axis=1).values.reshape(-1, 1)
+        mix_dict[mix] = _production_columns(mix_dict[mix])
     flows_dict = get_flows_kwh(p, raw_prodExch)
 
     ###############################
@@ -267,6 +262,13 @@ def get_prod_mix_impacts(config, missing_mapping='error', is_verbose=False, prog
     return flows_dict, prod_mix_dict, mix_dict, prod_imp_dict, imp_dict
 
 
+def _production_columns(mix: pd.DataFrame) -> pd.DataFrame:
+    """Keeps the production columns of a mix (drops the 'Mix_' columns, except 'Mix_Other'), in float32.
+    The columns are selected with one vectorized mask instead of a test per column name."""
+    is_import = mix.columns.str.startswith('Mix') & ~mix.columns.str.endswith('Other')
+    return mix.loc[:, ~is_import].astype('float32')
+
+
 ########################################
 # ######################################
 # Get inverted matrix
@@ -165,7 +165,7 @@ def get_steps_per_hour(freq, dtype=int):
         the number of time steps per hour to expect in a time series.
     """
     ### Make sure it starts with a number
-    if not np.any([freq.startswith(k) for k in '0123456789']): # If starts with a letter
+    if not freq.startswith(tuple('0123456789')): # If starts with a letter
         frequency = f"1{freq}"
     else: frequency = freq
     
@@ -312,15 +312,15 @@ def select_long_gaps(gaps, name, lower, upper, length):
 def add_specific_gaps(all_gaps, name, length, long_gaps):
     ### Specific to solar data
     # At the start
-    if np.logical_and.reduce([name == 'Solar', # If solar
-                              all_gaps[0,1]==0, # If gap at the start
-                              all_gaps[0].tolist() not in long_gaps.tolist()]): # If not already long gap
+    if (name == 'Solar' # If solar
+            and all_gaps[0,1]==0 # If gap at the start
+            and all_gaps[0].tolist() not in long_gaps.tolist()): # If not already long gap
         long_gaps = np.concatenate( [all_gaps[[0]],long_gaps], axis=0 )
 
     # At the end
-    if np.logical_and.reduce([name == 'Solar', # If solar
-                              all_gaps[-1,2]==length, # If gap at the end
-                              all_gaps[-1].tolist() not in long_gaps.tolist()]): # If not already long gap
+    if (name == 'Solar' # If solar
+            and all_gaps[-1,2]==length # If gap at the end
+            and all_gaps[-1].tolist() not in long_gaps.tolist()): # If not already long gap
         long_gaps = np.concatenate( [long_gaps, all_gaps[[-1]] ], axis=0 )
     
     return long_gaps
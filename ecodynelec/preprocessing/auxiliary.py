@@ -5,6 +5,7 @@ that may be required during the execution of `ecodynelec` proceses.
 
 import os
 import warnings
+from functools import lru_cache
 
 import numpy as np
 import pandas as pd
@@ -12,6 +13,7 @@ import tabula as tabula
 
 ################# Local functions
 from ecodynelec.checking import check_frequency
+from ecodynelec.saving import FREQ_LABELS
 
 
 # +
@@ -54,9 +56,11 @@ def load_swissGrid(path_sg, start=None, end=None, freq='H'):
     if end is not None: end = pd.to_datetime(end)
 
     ### Import SwissGrid data
-    sg = pd.read_csv(path_sg, index_col=0, parse_dates=True, dtype="float32")
-
-    sg = sg.drop(columns=["Consommation_CH", "Consommation_Brut_CH"])  # Remove unused columns
+    if isinstance(path_sg, (str, os.PathLike)):
+        path_sg = os.path.abspath(path_sg)
+        sg = _cached_swissGrid(path_sg, os.path.getmtime(path_sg))  # Shared table: only read below
+    else:
+        sg = _read_swissGrid(path_sg)  # File-like object, not cached
 
     ### Check info availability (/!\ if sg smaller, big problem not filled yet !!!)
     if 'Production_CH' not in sg.columns:
@@ -68,12 +72,24 @@ def load_swissGrid(path_sg, start=None, end=None, freq='H'):
         msg = "  /!\ Resudual computed only during {} - {}. SwissGrid Data not available on the rest of the period."
         warnings.warn(msg.format(sg.loc[start:end].index[0], sg.loc[start:end].index[-1]))
 
-    ### Rename the columns
-    sg.columns = ["Production_CH", "Mix_CH_AT", "Mix_AT_CH", "Mix_CH_DE", "Mix_DE_CH",
-                  "Mix_CH_FR", "Mix_FR_CH", "Mix_CH_IT", "Mix_IT_CH"]
+    ### Select the interesting data (copied, the cached table stays untouched) and rename the columns
+    sg = sg.loc[start:end, :].set_axis(["Production_CH", "Mix_CH_AT", "Mix_AT_CH", "Mix_CH_DE", "Mix_DE_CH",
+                                        "Mix_CH_FR", "Mix_FR_CH", "Mix_CH_IT", "Mix_IT_CH"], axis=1)
+
+    ### Resample to right frequency and convert kWh -> MWh
+    return sg.resample(freq).sum() / 1000
+
+
+def _read_swissGrid(path_sg):
+    """Parses the SwissGrid file, without the unused columns."""
+    sg = pd.read_csv(path_sg, index_col=0, parse_dates=True, dtype="float32")
+    return sg.drop(columns=["Consommation_CH", "Consommation_Brut_CH"])  # Remove unused columns
+
 
-    ### Select the interesting data, resample to right frequency and convert kWh -> MWh
-    return sg.loc[start:end, :].resample(freq).sum() / 1000
+@lru_cache(maxsize=2)
+def _cached_swissGrid(path_sg, mtime):
+    """Parses the SwissGrid file once per file path and modification time, for repeated runs."""
+    return _read_swissGrid(path_sg)
 
 
 # +
@@ -327,10 +343,8 @@ def load_rawEntso(mix_data, freq='H'):
     ################################################
     if type(mix_data) == str:  # Import from file
         check_frequency(freq)  # Check the frequency
-        tPass = {'15min': '15min', '30min': '30min', "H": "hour", "D": "day", 'd': 'day', 'W': "week",
-                 "w": "week", "MS": "month", "M": "month", "YS": "year", "Y": "year"}
 
-        data = pd.read_csv(mix_data + f"ProdExchange_{tPass[freq]}.csv",
+        data = pd.read_csv(mix_data + f"ProdExchange_{FREQ_LABELS[freq]}.csv",
                            index_col=0, parse_dates=True)
     elif type(mix_data) == pd.core.frame.DataFrame:  # import from the DataFrame passed as argument
         data = mix_data
@@ -413,8 +427,8 @@ def load_ch_enr_model(ch_enr_model_path, start, end, freq):
 
     enr_prod_ch = pd.read_csv(ch_enr_model_path, index_col=0, parse_dates=[0]).astype(float)
     # Verify that the dataframe contains the right columns
-    assert np.all([c in enr_prod_ch.columns for c in
-                   ['Wind', 'Solar', 'Waste', 'Biogas', 'Sewage_gas', 'Biomass_1_crops', 'Biomass_2_waste']])
+    assert all(c in enr_prod_ch.columns for c in
+               ['Wind', 'Solar', 'Waste', 'Biogas', 'Sewage_gas', 'Biomass_1_crops', 'Biomass_2_waste'])
     # Adapt the dataframe to the right format
     enr_prod_ch = enr_prod_ch.loc[start + pd.Timedelta('1H'):end + pd.Timedelta('1H')] / 1000  # Convert from kWh to MWh
     name_map = {
@@ -1,17 +1,19 @@
 """Module reaching ENTSO-E server and downloading data"""
 
 import os
-from datetime import datetime, timedelta
-from functools import partial
-from getpass import getpass
-from time import time
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from time import monotonic, time
 
 import pandas as pd
-import paramiko
 
 from ecodynelec.parameter import Parameter
 from ecodynelec.progress_info import ProgressInfo
 
+_LOCAL_BUFFER_SIZE = 1 << 20  # Write buffer (bytes) of downloaded files
+
 
 # +
 
@@ -23,7 +25,7 @@ from ecodynelec.progress_info import ProgressInfo
 # -
 
 
-def download(config, threshold_minutes=15, threshold_size=.9, is_verbose=False):
+def download(config, threshold_minutes=15, threshold_size=.9, is_verbose=False, n_threads=4):
     """Downloads data from ENTSO-E servers and save it.
 
     Parameters
@@ -41,6 +43,9 @@ def download(config, threshold_minutes=15, threshold_size=.9, is_verbose=False):
             which to download, if the last download is newer than `threshold_minutes`.
         is_verbose: bool, default to False
             to display information during the download
+        n_threads: int, default to 4
+            number of files downloaded simultaneously, each over its own
+            SFTP channel of the same connection.
 
     Returns
     -------
@@ -57,25 +62,24 @@ def download(config, threshold_minutes=15, threshold_size=.9, is_verbose=False):
 
     ### Get the start and end dates
     dates = _set_time(config.start, config.end)
+    server, path = config.server, config.path
 
     ### Decide on the files to download
-    file_list = {k: _get_file_list(*dates, getattr(config.server, f'_remote{k}Dir'),
-                                   getattr(config.server, f'_name{k}File'))
-                 for k in ['Generation', 'Exchanges']}
+    file_list = {'Generation': _get_file_list(*dates, server._remoteGenerationDir, server._nameGenerationFile),
+                 'Exchanges': _get_file_list(*dates, server._remoteExchangesDir, server._nameExchangesFile)}
 
     ### Point to the saving locations
-    save_list = {k: _get_file_list(*dates, getattr(config.path, k.lower()),
-                                   getattr(config.server, f'_name{k}File'))
-                 for k in file_list}
+    save_list = {'Generation': _get_file_list(*dates, path.generation, server._nameGenerationFile),
+                 'Exchanges': _get_file_list(*dates, path.exchanges, server._nameExchangesFile)}
 
     ### Clear directories
-    if config.server.removeUnused:
-        _remove_olds(config.path.generation, save_list['Generation'])  # Remove unused generation
-        _remove_olds(config.path.exchanges, save_list['Exchanges'])  # Remove unused exchanges
+    if server.removeUnused:
+        _remove_olds(path.generation, save_list['Generation'])  # Remove unused generation
+        _remove_olds(path.exchanges, save_list['Exchanges'])  # Remove unused exchanges
 
     ### Download files
-    _reach_server(config.server, files=file_list, savepaths=save_list, is_verbose=is_verbose,
-                  threshold_minutes=threshold_minutes, threshold_size=threshold_size)
+    _reach_server(server, files=file_list, savepaths=save_list, is_verbose=is_verbose,
+                  threshold_minutes=threshold_minutes, threshold_size=threshold_size, n_threads=n_threads)
 
     ### EOF
     if is_verbose: print(f"\tDownload from server: {time() - t0:.2f} sec" + " " * 40)
@@ -93,10 +97,11 @@ def download(config, threshold_minutes=15, threshold_size=.9, is_verbose=False):
 
 
 def _reach_server(server_info, files, savepaths, threshold_minutes=15, threshold_size=.9, is_verbose=False,
-                  progress_bar: ProgressInfo = None):
+                  progress_bar: ProgressInfo = None, n_threads=4):
     """Function establishing the connection with the server using credentials
     , collecting files and saving them. Nothing is returned.
     """
+    import paramiko  # Imported only when downloading (slow to import)
 
     ### Create the connection
     if is_verbose: print("Connection...", end='\r')
@@ -111,14 +116,15 @@ def _reach_server(server_info, files, savepaths, threshold_minutes=15, threshold
     if server_info.password is None:
         password = _manage_password()
 
+    transport = _open_transport(server_info)  # Handshake only once, retry only the authentication
     is_valid, safety_loop = False, 1
     while not is_valid:
-        transport = paramiko.Transport((server_info.host, server_info.port))
         try:
-            transport.connect(username=server_info.username, password=password)
+            transport.auth_password(username=server_info.username, password=password)
             is_valid = True  # Success
         except paramiko.AuthenticationException as authentication_error:
             if safety_loop == 0:
+                transport.close()  # Close the transport
                 message = "Connection failed. Your password may be outdated. "
                 message += "Please verify by logging in at https://transparency.entsoe.eu/"
                 print(message)
@@ -126,9 +132,10 @@ def _reach_server(server_info, files, savepaths, threshold_minutes=15, threshold
             else:
                 print("Error in Password or Username. Connection failed.")
                 safety_loop -= 1  # One chance less
-                transport.close()  # Close the transport
-                # del transport
                 password = _manage_password()  # New try for password
+                if not transport.is_active():  # The server closed the connection
+                    transport.close()
+                    transport = _open_transport(server_info)
 
     ### Create a data pipe between local and remote
     if is_verbose: print("Create pipe...", end='\r')
@@ -139,26 +146,29 @@ def _reach_server(server_info, files, savepaths, threshold_minutes=15, threshold
     else:
         dl_bar = None
     with paramiko.SFTPClient.from_transport(transport) as sftp:
-        ### Download all files
+        ### List each remote directory once instead of querying each file
+        remote_attrs = {}
+        for remote_dir in {posixpath.dirname(remote) for categ in files for remote in files[categ]}:
+            try:
+                listing = sftp.listdir_attr(remote_dir)
+            except FileNotFoundError:  # Directory not published (yet): its files are skipped below
+                listing = []
+            remote_attrs.update({posixpath.join(remote_dir, attr.filename): attr for attr in listing})
+
+        ### Select the files to download
+        tasks = []
         for categ in files:  # Generation then Exchanges
             for i, (remote, local) in enumerate(zip(files[categ], savepaths[categ])):  # For each file
-                try:
-                    if progress_bar:
-                        progress_bar.set_sub_label(f'Check file: {categ} {i + 1}/{len(files[categ])}')
-                    if not _should_download(sftp, remote, local, threshold_minutes, threshold_size): continue;
-                    if dl_bar:
-                        dl_bar.show()
-                        dl_bar.progress(local, 0)
-
-                    callback_fct = None
-                    if is_verbose or progress_bar is not None:
-                        callback_fct = partial(_progressBar, info=f"{categ} {i + 1}/{len(files[categ])}",
-                                               is_verbose=is_verbose, progress_bar=dl_bar)
-                    sftp.get(remotepath=remote, localpath=local,
-                             callback=callback_fct)
-                except FileNotFoundError as e:
+                if progress_bar:
+                    progress_bar.set_sub_label(f'Check file: {categ} {i + 1}/{len(files[categ])}')
+                if remote not in remote_attrs:
                     print(f"ERROR: File {remote} (local: {local} not found. Skipping...")
                     continue;
+                if not _should_download(remote_attrs[remote], local, threshold_minutes, threshold_size): continue;
+                tasks.append((remote, local, f"{categ} {i + 1}/{len(files[categ])}"))
+
+    ### Download all files
+    _download_files(transport, tasks, n_threads=n_threads, is_verbose=is_verbose, progress_bar=dl_bar)
 
     if dl_bar: dl_bar.hide()
     ### Close the connection to transport (already done for sftp)
@@ -166,6 +176,75 @@ def _reach_server(server_info, files, savepaths, threshold_minutes=15, threshold
     ### EOF
 
 
+# +
+
+#################
+#################
+# ## Open Transport
+##############
+
+# -
+
+
+def _open_transport(server_info):
+    """Opens a connection to the server and negotiates the SSH session,
+    without authenticating. Returns the paramiko.Transport."""
+    import paramiko
+    transport = paramiko.Transport((server_info.host, server_info.port))
+    transport.start_client()
+    return transport
+
+
+# +
+
+#################
+#################
+# ## Download Files
+##############
+
+# -
+
+
+def _download_files(transport, tasks, n_threads=4, is_verbose=False, progress_bar: ProgressInfo = None):
+    """Downloads the files listed in `tasks` as (remote, local, info) tuples.
+    Downloads are spread on `n_threads` threads, each thread using its own
+    SFTP channel over the shared `transport`. Nothing is returned.
+    """
+    import paramiko
+    channels = threading.local()  # One SFTP channel per thread
+    opened = []  # Keep track of all channels to close them
+    lock = threading.Lock()
+    display_lock = threading.Lock()  # The progress bar and the prints are shared by all threads
+
+    def fetch(task):
+        remote, local, info = task
+        if not hasattr(channels, 'sftp'):
+            channels.sftp = paramiko.SFTPClient.from_transport(transport)
+            with lock:
+                opened.append(channels.sftp)
+        try:
+            if progress_bar:
+                with display_lock:
+                    progress_bar.show()
+                    progress_bar.progress(local, 0)
+
+            callback_fct = None
+            if is_verbose or progress_bar is not None:
+                callback_fct = _ThrottledProgress(lock=display_lock, info=info, is_verbose=is_verbose,
+                                                  progress_bar=progress_bar)
+            with open(local, 'wb', buffering=_LOCAL_BUFFER_SIZE) as fl:  # Large buffer, fewer disk writes
+                channels.sftp.getfo(remotepath=remote, fl=fl, callback=callback_fct)
+        except FileNotFoundError as e:
+            print(f"ERROR: File {remote} (local: {local} not found. Skipping...")
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, n_threads)) as executor:
+            list(executor.map(fetch, tasks))  # Consume to raise errors from threads
+    finally:
+        for sftp in opened:
+            sftp.close()
+
+
 # +
 
 #################
@@ -191,7 +270,7 @@ def _set_time(start, end):
     elif start is None:  # End but no start -> 2 months before end
         all_months = pd.period_range(start=start, end=end, freq='M', periods=2)
 
-    return all_months.year, all_months.month
+    return all_months.year.to_numpy(), all_months.month.to_numpy()
 
 
 # +
@@ -229,6 +308,7 @@ def _manage_password():
     it might just have expired. If the correct password is not valid
     anymore, visit https://transparency.entsoe.eu/ to login and reset.
     """
+    from getpass import getpass
     return getpass("Password: ")
 
 
@@ -242,15 +322,14 @@ def _manage_password():
 # -
 
 
-def _should_download(sftp, remote, local, threshold_minutes=15, threshold_size=.9):
+def _should_download(remote_attr, local, threshold_minutes=15, threshold_size=.9):
     """Investigates whether to download a file or not.
 
     Parameters
     ----------
-        sftp
-            the connexion to server
-        remote: str
-            name of the remote file
+        remote_attr: paramiko.SFTPAttributes
+            attributes of the remote file (modification time and size),
+            as listed from its remote directory
         local: str
             local version of the file name, if it were to exist
         thershold_minutes: int, default to 15
@@ -273,14 +352,14 @@ def _should_download(sftp, remote, local, threshold_minutes=15, threshold_size=.
         return True
 
     ### IF REMOTE FILE IS NEWER THAN LOCAL, DOWNLOAD.
-    remote_mtime = datetime.fromtimestamp(getattr(sftp.lstat(remote), 'st_mtime'))
-    local_mtime = datetime.fromtimestamp(getattr(os.stat(local), 'st_mtime'))
-    delta_utc = datetime.utcnow() - datetime.now()  # Server is in UTC. Local files are in local time.
-    is_newer = (remote_mtime - (local_mtime + delta_utc)) > timedelta(minutes=threshold_minutes)
+    # Both timestamps are read in UTC, no correction of the local timezone is needed.
+    remote_mtime = datetime.fromtimestamp(getattr(remote_attr, 'st_mtime'), tz=timezone.utc)
+    local_mtime = datetime.fromtimestamp(getattr(os.stat(local), 'st_mtime'), tz=timezone.utc)
+    is_newer = (remote_mtime - local_mtime) > timedelta(minutes=threshold_minutes)
     if is_newer: return True
 
     ### IF REMOTE IS (SIGNIFICANTLY) LARGER, DOWNLOAD
-    remote_size = getattr(sftp.lstat(remote), 'st_size')  # Size of remote document
+    remote_size = getattr(remote_attr, 'st_size')  # Size of remote document
     local_size = getattr(os.stat(local), 'st_size')  # Size of local document
     is_larger = ((remote_size - local_size) / remote_size) > (1 - threshold_size)
     if is_larger: return True
@@ -301,7 +380,9 @@ def _should_download(sftp, remote, local, threshold_minutes=15, threshold_size=.
 
 def _remove_olds(path, local_list):
     """Clears unused files in local directory"""
-    remove_list = [path + f for f in os.listdir(path) if ((f not in local_list) & (os.path.isfile(path + f)))]
+    keep = {os.path.basename(f) for f in local_list}  # Names of the files to keep
+    with os.scandir(path) as entries:
+        remove_list = [e.path for e in entries if ((e.name not in keep) and e.is_file())]
     for f in remove_list:
         os.remove(f)  # Delete the file
     # EOF
@@ -327,3 +408,24 @@ def _progressBar(transferred, toBeTransferred, info, is_verbose=False, progress_
         progress_bar.set_max_value(int(toBeTransferred))
         progress_bar.set_progress(int(transferred))
         progress_bar.set_sub_label(f'{transferred / 1024 ** 2:.1f}/{toBeTransferred / 1024 ** 2:.1f} MB')
+
+
+class _ThrottledProgress:
+    """Callback for `sftp.getfo` calling `_progressBar` at most once every `interval`
+    seconds, and always once the transfer is complete. The display is updated under
+    `lock` (if given), as several downloads may report at the same time."""
+
+    def __init__(self, interval=0.1, lock=None, **kwargs):
+        self.interval = interval
+        self.lock = lock if lock is not None else threading.Lock()
+        self.kwargs = kwargs  # Arguments of _progressBar
+        self.last_update = None
+
+    def __call__(self, transferred, toBeTransferred):
+        now = monotonic()
+        if ((self.last_update is not None) and (now - self.last_update < self.interval)
+                and (transferred < toBeTransferred)):
+            return
+        self.last_update = now
+        with self.lock:
+            _progressBar(transferred, toBeTransferred, **self.kwargs)
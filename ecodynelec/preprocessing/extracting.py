@@ -3,8 +3,8 @@ Module containing the functions loading the downloaded data
 from the ENTOS-E databases
 """
 
-import concurrent
 import os
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from time import time
 
@@ -14,6 +14,8 @@ import pandas as pd
 from ecodynelec.preprocessing.autocomplete import autocomplete
 from ecodynelec.progress_info import ProgressInfo
 
+_CHUNK_ROWS = 500_000  # Rows parsed at once from a single ENTSO-E file
+
 
 # +
 
@@ -162,20 +164,24 @@ def create_per_country(path_dir: dict, case: str, start=None, end=None, ctry: li
 
     # Get auxilary information
     prod_units = get_origin_unit(df, origin)  # list of prod units or origin countries
-    time_line = get_time_line(unique_dates=df.DateTime.unique())  # time line of the data
+    time_line = get_time_line(dates=df.DateTime)  # time line of the data
 
     # Format and save files for every country
     Data = {}  # Data storage object
     t0 = time()
+    # Remove duplicates and split the data per country in a single pass
+    df = df[df.loc[:, destination].isin(ctry)].drop_duplicates()
+    rows_per_country = df.groupby(destination, sort=False, observed=True).indices
     for i, c in enumerate(ctry):  # for all countries
         if is_verbose: print(f"Extracting {case} for {c} ({i + 1}/{len(ctry)})...", end="\r")
         if progress_bar: progress_bar.set_sub_label(f"Extracting {case} for {c} ({i + 1}/{len(ctry)})...")
-        # Get data from the country and sort by date
-        country_data = df[df.loc[:, destination] == c].drop_duplicates().sort_values(by="DateTime")
+        # Get data from the country (pivot sorts by date)
+        country_data = df.iloc[rows_per_country.get(c, [])]
 
         # Select only the Generation data, then resample in 15min and interpolate (regardless of ResolutionCode)
-        Data[c] = country_data.pivot(index='DateTime', columns=origin, values=data)
+        Data[c] = scatter_pivot(country_data, origin, data)
         del country_data  # free memory space
+    del df, rows_per_country  # free memory space
 
     ### AUTOCOMPLETE THE DATA
     if progress_bar:
@@ -189,15 +195,14 @@ def create_per_country(path_dir: dict, case: str, start=None, end=None, ctry: li
     if progress_bar: progress_bar.set_sub_label('Formatting data...')
     ### ADD ALL COLUMNS AND FILL REST WITH ZERO
     for i, c in enumerate(ctry):
-        # Add all columns
-        country_detailed = pd.DataFrame(None, columns=prod_units, index=time_line,
-                                        dtype='float32').resample('15min').asfreq()  # init. with NaNs
-        country_detailed.loc[:, Data[c].columns] = Data[c]  # fill with data
+        # Add all columns and time steps at once (NaNs where no data)
+        country_detailed = Data[c].reindex(index=time_line, columns=prod_units).astype('float32')
+        country_detailed.columns.name = None  # as the original header of saved files
 
         # Save files
         if savedir is not None:
             country_detailed.to_csv(f"{savedir}{c}_{case}_MW.csv")
-        Data[c] = country_detailed.copy()  # Store information in variables (with non-missing NaNs)
+        Data[c] = country_detailed  # Store information in variables (with non-missing NaNs)
         del country_detailed  # free memory space
     if is_verbose: print(f"Extraction raw {case}: {time() - t0:.2f} sec.             ")
     if progress_bar: progress_bar.reset_sub_label()
@@ -250,12 +255,12 @@ def load_files(path_dir, start=None, end=None, destination=None, origin=None, da
             if is_verbose: print(f"Extract file {i + 1}/{len(files)}...", end="\r")
             container.append(load_single_files(f, column_types, area, useful, date_col=date_col, area_level=area_level, status_col=status_col))
 
-    # Multi-processing
+    # Multi-threading (the csv parser releases the GIL, and no data is copied between processes)
     else:
         if is_verbose: print(f"Extract {len(files)} files...", end='\r')
         subfunc = partial(load_single_files, column_types=column_types, area=area, useful=useful, date_col=date_col, area_level=area_level, status_col=status_col)
         container = []
-        with concurrent.futures.ProcessPoolExecutor() as pool:
+        with ThreadPoolExecutor() as pool:
             for d in pool.map(subfunc, files):
                 container.append(d)
 
@@ -264,6 +269,9 @@ def load_files(path_dir, start=None, end=None, destination=None, origin=None, da
     if progress_bar: progress_bar.set_sub_label('concatenate all files...')
     df = pd.concat(container)
     del container  # free memory space
+    # Few distinct countries and units: categories take less memory and compare faster
+    df[destination] = df[destination].astype('category')
+    df[origin] = df[origin].astype('category')
 
     if is_verbose: print(f"Data loading: {round(time() - t0, 2)} sec")
     if is_verbose: print(f"Memory usage table: {round(df.memory_usage().sum() / (1024 ** 2), 2)} MB")
@@ -316,17 +324,49 @@ def _get_file_list(start, end, path_dir):
 def load_single_files(file_path, column_types, area, useful, date_col=['DateTime'], area_level='CTY', status_col=None):
     """Load the ENTSO-E data for a single file
     """
-    # Extract the information
-    d = pd.read_csv(file_path, sep="\t", encoding='utf-8', parse_dates=date_col, dtype=column_types)
-
-    # Only select country level & Useful columns
-    d = d.loc[d.loc[:, area] == area_level, useful]
+    # Extract the information (only parse the needed columns), by chunks to bound the memory
+    reader = pd.read_csv(file_path, sep="\t", encoding='utf-8', parse_dates=date_col, dtype=column_types,
+                         usecols=lambda col: (col in useful) or (col == area), chunksize=_CHUNK_ROWS)
+
+    # Only select country level & Useful columns (filter each chunk before keeping it)
+    with reader:
+        d = pd.concat([chunk.loc[chunk.loc[:, area] == area_level, useful] for chunk in reader],
+                      ignore_index=True)
     if status_col:
         d = d.loc[(d[status_col] != 'Cancelled') & (d[status_col] != 'Withdrawn')]
         d['FromFile'] = file_path
     return d
 
 
+# +
+
+####################
+####################
+# ## Scatter pivot
+##############
+
+# -
+
+
+def scatter_pivot(df, origin, data):
+    """Reshapes the data of a country into a table (DateTime x origin), as
+    `df.pivot(index='DateTime', columns=origin, values=data)` would, by scattering
+    the values into a pre-allocated array instead of using pandas' reshaping."""
+    date_idx, dates = pd.factorize(df['DateTime'], sort=True)
+    origin_idx, origins = pd.factorize(df[origin], sort=True)
+
+    # Same safety as pivot: each (date, origin) pair must be unique
+    positions = date_idx * len(origins) + origin_idx
+    if (len(positions) > 0) and (np.bincount(positions).max() > 1):
+        raise ValueError("Index contains duplicate entries, cannot reshape")
+
+    values = df[data].to_numpy()
+    table = np.full((len(dates), len(origins)), np.nan, dtype=values.dtype)
+    table[date_idx, origin_idx] = values
+    return pd.DataFrame(table, index=pd.DatetimeIndex(dates, name='DateTime'),
+                        columns=pd.Index(np.asarray(origins), name=origin))
+
+
 # +
 
 ####################
@@ -339,7 +379,10 @@ def load_single_files(file_path, column_types, area, useful, date_col=['DateTime
 
 def get_origin_unit(df, origin):
     """Gets ordered list of sources (origin countries or production units)"""
-    return np.sort(df.loc[:, origin].unique())
+    column = df.loc[:, origin]
+    if isinstance(column.dtype, pd.CategoricalDtype):  # categories are already the unique values
+        return column.cat.remove_unused_categories().cat.categories.sort_values().to_numpy()
+    return np.sort(column.unique())
 
 
 # +
@@ -352,16 +395,15 @@ def get_origin_unit(df, origin):
 # -
 
 
-def get_time_line(unique_dates):
-    """Gets the time line and corrects it if needed"""
-    # Get the time line
-    time_line = pd.DatetimeIndex(np.sort(unique_dates))
+def get_time_line(dates, freq='15min'):
+    """Gets the regular time line covering the dates (only their bounds are needed)"""
+    start, end = dates.min(), dates.max()
 
     # Add last hour in 15min, if not already here
-    if time_line[-1].minute == 0:
-        time_line = pd.DatetimeIndex(time_line.to_list() + [time_line[-1] + pd.Timedelta("45T")])
+    if end.minute == 0:
+        end = end + pd.Timedelta("45min")
 
-    return time_line
+    return pd.date_range(start=start, end=end, freq=freq)
 
 
 # +
@@ -147,7 +147,7 @@ def extract_mapping(ctry, mapping_path=None, cst_import=False, residual=False, t
 
     for c in ctry:
         if is_verbose: print(f"/ {c} ", end="")
-        if np.logical_and(cst_import, (c != target)):  # Constant imports for other countries
+        if cst_import and (c != target):  # Constant imports for other countries
             impacts[c] = set_constant_impacts(country_from_excel(mapping=mapping_path, place=c),
                                               constant=impacts['Other'].loc['Mix_Other'])
         else:
@@ -178,8 +178,9 @@ def define_local_gap(local_prod, sg_data, gap=None):
     pandas.DataFrame
         the relative residual information.
     """
-    production = [k for k in local_prod.columns if k[:3] != 'Mix']
-    local_mix = [k for k in local_prod.columns if k[:3] == 'Mix']
+    is_mix = local_prod.columns.str.startswith('Mix')  # vectorized selection of the imports
+    production = local_prod.columns[~is_mix]
+    local_mix = local_prod.columns[is_mix]
 
     # Residual prod in MWh
     d = import_residual(local_prod.loc[:, production], sg_data=sg_data, gap=gap)
@@ -188,7 +189,7 @@ def define_local_gap(local_prod, sg_data, gap=None):
     d = pd.concat([d, local_prod.loc[:, local_mix]], axis=1)  # set back the imports
 
     ## Compute relative amount of residual column(s)
-    residual_col = [k for k in d.columns if k.split("_")[0] == "Residual"]
+    residual_col = d.columns[d.columns.str.split("_").str[0] == "Residual"]
     total = d.sum(axis=1)
     for k in residual_col:
         d.loc[:, k] /= total
@@ -1,5 +1,9 @@
 import pandas
 
+# Label of each frequency in the names of saved files
+FREQ_LABELS = {'15min':'15min','30min':'30min',"H":"hour","D":"day",'d':'day','W':"week",
+               "w":"week","MS":"month","M":"month","YS":"year","Y":"year"}
+
 
 # +
 
@@ -57,9 +61,7 @@ def save_dataset(data, savedir, name, target=None, freq='H'):
             the frequency
     """
     ### Formating the time extension
-    tPass = {'15min':'15min','30min':'30min',"H":"hour","D":"day",'d':'day','W':"week",
-             "w":"week","MS":"month","M":"month","YS":"year","Y":"year"}
     as_target = "" if target is None else f"_{target}"
     
     ### Saving
-    data.to_csv(savedir+f"{name}{as_target}_{tPass[freq]}.csv",index=True)
+    data.to_csv(savedir+f"{name}{as_target}_{FREQ_LABELS[freq]}.csv",index=True)
@@ -90,12 +90,12 @@ def compute_producing_mix(df, ctry, prod_means):
         pandas.DataFrame
             table with the production mix in the studied countries (parameter.ctry + 'Other'), containing each production mean of each country at each time step.
     """
-    prod_mix = pd.DataFrame(index=df.index, columns=df.columns)
+    shares = []
     for c in ctry:
-        sources = [f'{src}_{c}' for src in prod_means]
-        total = df[sources].sum(axis=1)
-        for src in sources:
-            prod_mix[f'{src}'] = df[src] / total
+        sources = df[[f'{src}_{c}' for src in prod_means]]
+        shares.append(sources.div(sources.sum(axis=1), axis=0))  # all the sources of a country at once
+    # Gather the countries in one concatenation, in the order of the original columns
+    prod_mix = pd.concat(shares, axis=1).reindex(columns=df.columns)
     return prod_mix
 
 
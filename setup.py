@@ -26,4 +26,5 @@ setup(
         "Operating System :: OS Independent",
     ],
     install_requires=requirements,
+    extras_require={"calamine": ["python-calamine"]}, # Faster spreadsheet reader (pandas >= 2.2)
 )
@@ -21,6 +21,7 @@ if __name__ == '__main__':
         os.system(f"{python} -m pip install -e {package}")
 
     from test_load_downloads import TestDownload
+    from test_load_download_files import TestDownloadFiles
     from test_load_extracting import TestExtracting # Use Files
     from test_load_auxiliary import TestAuxiliary # Use Files
     from test_load_impacts import TestLoadImpacts # Use Files
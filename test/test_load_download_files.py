@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+from ecodynelec.preprocessing import downloading
+
+
+class TestDownloadFiles(unittest.TestCase):
+    """Tests of the local file handling of the downloads, without connection to the server."""
+
+    def test_remove_olds(self):
+        with tempfile.TemporaryDirectory() as path:
+            kept = ['2021_01_AggregatedGenerationPerType_16.1.B_C.csv', '2021_02_AggregatedGenerationPerType_16.1.B_C.csv']
+            stale = ['2020_12_AggregatedGenerationPerType_16.1.B_C.csv', 'old_notes.txt']
+            for f in kept + stale:
+                open(os.path.join(path, f), 'w').close()
+            os.mkdir(os.path.join(path, 'subdir'))  # Directories are never removed
+
+            downloading._remove_olds(path, [os.path.join(path, f) for f in kept])
+
+            self.assertEqual(sorted(os.listdir(path)), sorted(kept + ['subdir']))
+
+    def test_should_download(self):
+        with tempfile.TemporaryDirectory() as path:
+            local = os.path.join(path, '2021_01_AggregatedGenerationPerType_16.1.B_C.csv')
+            local_time = time.time() - 3600
+            size = 1000
+
+            ### No local file
+            remote = SimpleNamespace(st_mtime=local_time, st_size=size)
+            self.assertTrue(downloading._should_download(remote, local), msg='missing local file')
+
+            with open(local, 'wb') as f:
+                f.write(b'0' * size)
+            os.utime(local, (local_time, local_time))
+
+            ### Same time and size
+            self.assertFalse(downloading._should_download(remote, local), msg='same file')
+            ### Remote updated within the threshold (UTC timestamps on both sides)
+            remote = SimpleNamespace(st_mtime=local_time + 10 * 60, st_size=size)
+            self.assertFalse(downloading._should_download(remote, local), msg='remote 10 minutes newer')
+            ### Remote updated after the threshold
+            remote = SimpleNamespace(st_mtime=local_time + 20 * 60, st_size=size)
+            self.assertTrue(downloading._should_download(remote, local), msg='remote 20 minutes newer')
+            ### Local file older than remote one: no download
+            remote = SimpleNamespace(st_mtime=local_time - 2 * 3600, st_size=size)
+            self.assertFalse(downloading._should_download(remote, local), msg='remote older')
+            ### Local file significantly smaller
+            remote = SimpleNamespace(st_mtime=local_time, st_size=2 * size)
+            self.assertTrue(downloading._should_download(remote, local), msg='local file smaller')
+
+
+#############
+if __name__ == '__main__':
+    res = unittest.main(verbosity=2)
@@ -1,5 +1,7 @@
 import unittest
 import os, shutil
+import numpy as np
+import pandas as pd
 from pandas.core.frame import DataFrame
 
 from ecodynelec.preprocessing import extracting
@@ -51,6 +53,20 @@ class TestExtracting(unittest.TestCase):
         with self.assertRaises(KeyError):
             extracting.extract(ctry=['CH'], dir_gen=None, dir_imp=None)
             
+    def test_scatter_pivot(self): # Same table as DataFrame.pivot
+        df = pd.DataFrame({'DateTime': pd.to_datetime(['2021-01-01 01:00','2021-01-01 00:00','2021-01-01 00:00']),
+                           'ProductionType': pd.Categorical(['Solar','Solar','Nuclear']),
+                           'ActualGenerationOutput': np.array([1., 2., 3.], dtype='float32')})
+        expected = df.pivot(index='DateTime', columns='ProductionType', values='ActualGenerationOutput')
+        out = extracting.scatter_pivot(df, 'ProductionType', 'ActualGenerationOutput')
+        pd.testing.assert_frame_equal(out, expected, check_column_type=False, check_categorical=False)
+        
+    def test_scatter_pivotDuplicates(self): # Error if a (date, origin) pair is not unique
+        df = pd.DataFrame({'DateTime': pd.to_datetime(['2021-01-01 00:00']*2),
+                           'ProductionType': ['Solar','Solar'], 'ActualGenerationOutput': [1., 2.]})
+        with self.assertRaises(ValueError):
+            extracting.scatter_pivot(df, 'ProductionType', 'ActualGenerationOutput')
+            
     def test_extractGen(self): # Check the nature of returned elments
         root = get_rootpath(level=1)
         list_countries = ['AT','CH','DE','FR','IT']
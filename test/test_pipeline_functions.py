@@ -1,6 +1,8 @@
 import os
 import unittest
+from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 
 from ecodynelec import pipeline_functions
@@ -107,7 +109,7 @@ class TestPipelineFunctions(unittest.TestCase):
         flows_df = pd.DataFrame.from_dict(flows_dict)
 
         # Test production kwh calculation
-        kwh = pipeline_functions.get_producing_mix_kwh(flows_df=flows_df, prod_mix_df=prod_df)
+        kwh = pipeline_functions.get_producing_mix_kwh(flows_df=flows_df, prod_mix_df=prod_df, validate=True)
         ### Test the type
         self.assertIsInstance(kwh, pd.DataFrame, msg='kwh is DataFrame')
         ### Test the contents
@@ -117,7 +119,7 @@ class TestPipelineFunctions(unittest.TestCase):
          not c.startswith('Mix_')]  # Check that prod columns are in mix_dict
 
         # Test production + imports - exports kwh calculation
-        kwh = pipeline_functions.get_consuming_mix_kwh(flows_df=flows_df, mix_df=mix_df)
+        kwh = pipeline_functions.get_consuming_mix_kwh(flows_df=flows_df, mix_df=mix_df, validate=True)
         ### Test the type
         self.assertIsInstance(kwh, pd.DataFrame, msg='kwh is DataFrame')
         ### Test the contents
@@ -134,6 +136,50 @@ class TestPipelineFunctions(unittest.TestCase):
         # needs to be tested with fake data and a local residual
         pass
 
+    def test_resample_sum(self):
+        index = pd.date_range('2021-01-01 00:15', '2021-01-03 22:45', freq='15min')
+        data = pd.DataFrame({'A': np.arange(len(index), dtype=float), 'B': 1.}, index=index)
+        data = data.drop(index[100:110])  # Periods without data
+        for freq in ['15min', '30min', 'H', 'D', 'W']:
+            pd.testing.assert_frame_equal(pipeline_functions._resample_sum(data, freq), data.resample(freq).sum(),
+                                          check_freq=False, obj=f'resampled to {freq}')
+
+    def test_unstack_targets(self):
+        index = pd.MultiIndex.from_product([pd.date_range('2021-01-01', periods=3, freq='H'), ['CH', 'FR', 'DE']])
+        mix_df = pd.DataFrame({'Mix_CH': np.arange(9.), 'Mix_FR': np.arange(9.) * 2}, index=index)
+        mix_df = mix_df.drop(index[4])  # Missing (time step, source) pair
+        unstacked = pipeline_functions._unstack_targets(mix_df, ['CH', 'FR'])
+        self.assertEqual(list(unstacked.keys()), ['CH', 'FR'])
+        for target in ['CH', 'FR']:
+            pd.testing.assert_frame_equal(unstacked[target], mix_df[f'Mix_{target}'].unstack(), check_names=False)
+
+    def test_split_time_steps(self):
+        steps = pd.date_range('2021-01-01', periods=3, freq='H')
+        index = pd.MultiIndex.from_product([steps, ['Plant_CH', 'Mix_FR_CH', 'Mix_Other']])
+        mix_df = pd.DataFrame({'Plant_CH': np.arange(9.), 'Mix_FR_CH': 1.}, index=index)
+        for table in [mix_df, mix_df.drop(index[4])]:  # Equal blocks, then irregular blocks
+            splits = pipeline_functions._split_time_steps(table)
+            self.assertEqual(len(splits), len(steps))
+            for split, step in zip(splits, steps):
+                pd.testing.assert_frame_equal(split, table.loc[step, :], check_names=False)
+
+    def test_localize_index(self):
+        # Spans the daylight saving time changes of March and October
+        for start, end in [('2021-03-27', '2021-03-29'), ('2021-10-30', '2021-11-01')]:
+            index = pd.date_range(start, end, freq='15min')
+            for timezone in ['CET', 'Europe/Zurich', 'UTC', 'Etc/GMT-1', 'Etc/GMT+2']:
+                expected = index.tz_localize(tz='utc').tz_convert(tz=timezone).tz_localize(None)
+                pd.testing.assert_index_equal(pipeline_functions._localize_index(index, timezone), expected,
+                                              obj=f'index in {timezone}')
+
+    def test_fixed_utc_offset(self):
+        self.assertEqual(pipeline_functions._fixed_utc_offset('UTC'), pd.Timedelta(0))
+        self.assertEqual(pipeline_functions._fixed_utc_offset('Etc/GMT-1'), pd.Timedelta(hours=1))
+        self.assertEqual(pipeline_functions._fixed_utc_offset('Etc/GMT+2'), pd.Timedelta(hours=-2))
+        self.assertEqual(pipeline_functions._fixed_utc_offset(ZoneInfo('Etc/GMT+2')), pd.Timedelta(hours=-2))
+        self.assertIsNone(pipeline_functions._fixed_utc_offset('CET'))  # Daylight saving time
+        self.assertIsNone(pipeline_functions._fixed_utc_offset('Europe/Zurich'))
+
 
 #############
 if __name__ == '__main__':